@@ -19,6 +19,8 @@ const DEFAULT_SETTINGS = {
   }
 };
 
+const MAX_SESSION_EVENTS = 3000;
+
 const DEFAULT_STATE = {
   active: false,
   session: null
@@ -29,25 +31,68 @@ function nowIso() {
 }
 
 function uid(prefix = 'id') {
-  return `${prefix}_${Date.now()}_${Math.random().toString(16).slice(2)}`;
+  return `${prefix}_${crypto.randomUUID()}`;
 }
 
+let cachedSettings = null;
+let settingsRead = null;
+
 async function getSettings() {
-  const stored = await chrome.storage.local.get(['settings']);
-  return { ...DEFAULT_SETTINGS, ...(stored.settings || {}) };
+  if (cachedSettings) return cachedSettings;
+  settingsRead ??= chrome.storage.local.get(['settings']).then((stored) => {
+    cachedSettings ??= { ...DEFAULT_SETTINGS, ...(stored.settings || {}) };
+  }, (error) => {
+    settingsRead = null;
+    throw error;
+  });
+  await settingsRead;
+  return cachedSettings;
 }
 
 async function saveSettings(settings) {
-  await chrome.storage.local.set({ settings: { ...DEFAULT_SETTINGS, ...settings } });
+  cachedSettings = { ...DEFAULT_SETTINGS, ...settings };
+  try {
+    await chrome.storage.local.set({ settings: cachedSettings });
+  } catch (error) {
+    cachedSettings = null;
+    settingsRead = null;
+    throw error;
+  }
 }
 
+let cachedState = null;
+let stateRead = null;
+
 async function getState() {
-  const stored = await chrome.storage.local.get(['state']);
-  return { ...DEFAULT_STATE, ...(stored.state || {}) };
+  if (cachedState) return cachedState;
+  // One storage read per worker lifetime; a state saved while it is pending wins over the stale copy.
+  stateRead ??= chrome.storage.local.get(['state']).then((stored) => {
+    cachedState ??= { ...DEFAULT_STATE, ...(stored.state || {}) };
+  }, (error) => {
+    stateRead = null;
+    throw error;
+  });
+  await stateRead;
+  return cachedState;
+}
+
+async function saveState(state, extra = {}) {
+  cachedState = state;
+  const changes = { ...extra, state };
+  try {
+    await chrome.storage.local.set(changes);
+  } catch (error) {
+    // A failed write (e.g. the storage quota) must not leave memory ahead of storage; re-read on next use.
+    cachedState = null;
+    stateRead = null;
+    throw error;
+  }
+  announceChange(Object.keys(changes));
 }
 
-async function saveState(state) {
-  await chrome.storage.local.set({ state });
+function announceChange(keys) {
+  // Open dashboards refetch on this hint; when no extension page is listening the send just rejects.
+  chrome.runtime.sendMessage({ type: 'PGW_STORAGE_CHANGED', keys }).catch(() => {});
 }
 
 function blankSession(meta = {}) {
@@ -76,16 +121,27 @@ function blankSession(meta = {}) {
       lastInputAt: null,
       recentPasteTimes: [],
       keyIntervals: [],
+      keyIntervalSum: 0,
+      keyIntervalSumSq: 0,
+      keyIntervalEvictions: 0,
+      ruleCounts: {},
+      lastFlagKeys: {},
       lastKeyTime: null
     },
     settingsSnapshot: null
   };
 }
 
+function eventTime(tPerf) {
+  // Content scripts stamp tPerf on the epoch clock, so events in one batch keep their own times.
+  const ms = Number(tPerf);
+  return Number.isFinite(ms) && ms > 0 ? new Date(ms).toISOString() : nowIso();
+}
+
 function sanitizeEvent(event, settings) {
   const safe = {
     id: uid('event'),
-    t: nowIso(),
+    t: eventTime(event.tPerf),
     tPerf: event.tPerf || 0,
     type: event.type,
     inputType: event.inputType || null,
@@ -109,25 +165,34 @@ function sanitizeEvent(event, settings) {
   return safe;
 }
 
-function updateStats(session, event) {
-  if (event.origin && !session.stats.activeDomains.includes(event.origin)) {
-    session.stats.activeDomains.push(event.origin);
+function ruleCounts(session) {
+  if (!session.analysis.ruleCounts) {
+    const counts = {};
+    for (const anomalyItem of session.anomalies) counts[anomalyItem.ruleId] = (counts[anomalyItem.ruleId] || 0) + 1;
+    session.analysis.ruleCounts = counts;
   }
+  return session.analysis.ruleCounts;
+}
 
-  if (event.type === 'paste') session.stats.pasteCount += 1;
-  if (event.type === 'copy') session.stats.copyCount += 1;
-  if (event.type === 'cut') session.stats.cutCount += 1;
-  if (event.type === 'drop') session.stats.dropCount += 1;
-  if (event.type === 'keydown') session.stats.keyCount += 1;
-  if (event.type === 'input' || event.type === 'beforeinput') session.stats.inputCount += 1;
-  if (event.insertedLength) session.stats.totalInsertedChars += event.insertedLength;
+function lastFlagKeys(session) {
+  if (!session.analysis.lastFlagKeys) {
+    const keys = {};
+    for (const anomalyItem of session.anomalies) keys[anomalyItem.ruleId] = anomalyItem.dedupeKey;
+    session.analysis.lastFlagKeys = keys;
+  }
+  return session.analysis.lastFlagKeys;
 }
 
-function anomaly(session, ruleId, severity, rationale, features = {}) {
+function anomaly(session, ruleId, severity, describe) {
   const existsKey = `${ruleId}:${Math.floor(Date.now() / 1000)}`;
-  const duplicate = session.anomalies.some((a) => a.dedupeKey === existsKey);
-  if (duplicate) return;
+  const flagKeys = lastFlagKeys(session);
+  if (flagKeys[ruleId] === existsKey) return;
+  flagKeys[ruleId] = existsKey;
 
+  const counts = ruleCounts(session);
+  counts[ruleId] = (counts[ruleId] || 0) + 1;
+
+  const { rationale, features = {} } = describe();
   session.anomalies.push({
     id: uid('anomaly'),
     dedupeKey: existsKey,
@@ -139,121 +204,186 @@ function anomaly(session, ruleId, severity, rationale, features = {}) {
   });
 }
 
-function stddev(values) {
-  if (values.length < 2) return 0;
-  const mean = values.reduce((a, b) => a + b, 0) / values.length;
-  const variance = values.reduce((sum, value) => sum + Math.pow(value - mean, 2), 0) / values.length;
-  return Math.sqrt(variance);
+const KEY_INTERVAL_RESYNC_EVICTIONS = 512;
+
+function resyncKeyIntervalSums(analysis) {
+  analysis.keyIntervalSum = 0;
+  analysis.keyIntervalSumSq = 0;
+  for (const value of analysis.keyIntervals) {
+    analysis.keyIntervalSum += value;
+    analysis.keyIntervalSumSq += value * value;
+  }
+  analysis.keyIntervalEvictions = 0;
+}
+
+function pushKeyInterval(analysis, interval, windowSize) {
+  if (typeof analysis.keyIntervalSum !== 'number') resyncKeyIntervalSums(analysis);
+
+  analysis.keyIntervals.push(interval);
+  analysis.keyIntervalSum += interval;
+  analysis.keyIntervalSumSq += interval * interval;
+
+  while (analysis.keyIntervals.length > windowSize) {
+    const evicted = analysis.keyIntervals.shift();
+    analysis.keyIntervalSum -= evicted;
+    analysis.keyIntervalSumSq -= evicted * evicted;
+    analysis.keyIntervalEvictions += 1;
+  }
+
+  // Running sums drift with floating-point cancellation; rebuild them from the window now and then.
+  if (analysis.keyIntervalEvictions >= KEY_INTERVAL_RESYNC_EVICTIONS) resyncKeyIntervalSums(analysis);
 }
 
-function evaluateEvent(session, event, settings) {
-  const tPerf = Number(event.tPerf || performance.now());
+function keyIntervalStats(analysis) {
+  const n = analysis.keyIntervals.length;
+  if (!n) return { avg: 0, sd: 0 };
+  const avg = analysis.keyIntervalSum / n;
+  if (n < 2) return { avg, sd: 0 };
+  const variance = Math.max(0, analysis.keyIntervalSumSq / n - avg * avg);
+  return { avg, sd: Math.sqrt(variance) };
+}
 
-  if (event.type === 'keydown') {
-    if (session.analysis.lastKeyTime) {
-      const interval = Math.max(0, tPerf - session.analysis.lastKeyTime);
-      if (interval < 2000) {
-        session.analysis.keyIntervals.push(interval);
-        if (session.analysis.keyIntervals.length > settings.uniformCadenceWindow) {
-          session.analysis.keyIntervals.shift();
-        }
-      }
+function checkKeyCadence(session, event, settings, tPerf) {
+  const analysis = session.analysis;
+  const windowSize = settings.uniformCadenceWindow;
+  if (analysis.lastKeyTime) {
+    const interval = Math.max(0, tPerf - analysis.lastKeyTime);
+    if (interval < 2000) {
+      pushKeyInterval(analysis, interval, windowSize);
     }
-    session.analysis.lastKeyTime = tPerf;
-    session.analysis.lastKeyAt = event.t;
-
-    if (session.analysis.keyIntervals.length >= settings.uniformCadenceWindow) {
-      const sd = stddev(session.analysis.keyIntervals);
-      const avg = session.analysis.keyIntervals.reduce((a, b) => a + b, 0) / session.analysis.keyIntervals.length;
-      if (avg > 30 && avg < 300 && sd <= settings.uniformCadenceStddevMs) {
-        anomaly(
-          session,
-          'timing_uniformity',
-          'medium',
-          `Keystroke cadence is unusually uniform (${Math.round(sd)}ms stddev across ${session.analysis.keyIntervals.length} intervals).`,
-          { stddevMs: Math.round(sd), averageMs: Math.round(avg), sampleSize: session.analysis.keyIntervals.length }
-        );
-      }
+  }
+  analysis.lastKeyTime = tPerf;
+  analysis.lastKeyAt = event.t;
+
+  const sampleSize = analysis.keyIntervals.length;
+  if (sampleSize >= windowSize) {
+    const { avg, sd } = keyIntervalStats(analysis);
+    if (avg > 30 && avg < 300 && sd <= settings.uniformCadenceStddevMs) {
+      anomaly(session, 'timing_uniformity', 'medium', () => ({
+        rationale: `Keystroke cadence is unusually uniform (${Math.round(sd)}ms stddev across ${sampleSize} intervals).`,
+        features: { stddevMs: Math.round(sd), averageMs: Math.round(avg), sampleSize }
+      }));
     }
   }
+}
 
-  const insertedLength = Number(event.insertedLength || event.clipboardLength || 0);
+function markInput(session, event) {
+  session.analysis.lastInputAt = event.t;
+}
 
-  if (['paste', 'drop', 'beforeinput', 'input'].includes(event.type)) {
-    session.analysis.lastInputAt = event.t;
+function checkPasteStreak(session, event, settings, tPerf) {
+  const recentPasteTimes = session.analysis.recentPasteTimes;
+  const cutoff = tPerf - settings.pasteStreakWindowMs;
+  // Batches from different tabs can interleave, so expired times are not always a leading run.
+  let kept = 0;
+  for (const pastedAt of recentPasteTimes) {
+    if (pastedAt >= cutoff) recentPasteTimes[kept++] = pastedAt;
   }
+  recentPasteTimes.length = kept;
+  recentPasteTimes.push(tPerf);
+
+  if (recentPasteTimes.length >= settings.pasteStreakCount) {
+    anomaly(session, 'multi_paste_streak', 'medium', () => ({
+      rationale: `${recentPasteTimes.length} paste events occurred within ${Math.round(settings.pasteStreakWindowMs / 1000)} seconds.`,
+      features: { pasteCount: recentPasteTimes.length, windowMs: settings.pasteStreakWindowMs }
+    }));
+  }
+}
 
-  if (event.type === 'paste') {
-    session.analysis.recentPasteTimes.push(tPerf);
-    const cutoff = tPerf - settings.pasteStreakWindowMs;
-    session.analysis.recentPasteTimes = session.analysis.recentPasteTimes.filter((x) => x >= cutoff);
-
-    if (session.analysis.recentPasteTimes.length >= settings.pasteStreakCount) {
-      anomaly(
-        session,
-        'multi_paste_streak',
-        'medium',
-        `${session.analysis.recentPasteTimes.length} paste events occurred within ${Math.round(settings.pasteStreakWindowMs / 1000)} seconds.`,
-        { pasteCount: session.analysis.recentPasteTimes.length, windowMs: settings.pasteStreakWindowMs }
-      );
-    }
+function checkLargeTransfer(session, event, settings, tPerf, insertedLength) {
+  if (insertedLength < settings.largeInsertionChars) return;
+  session.stats.largeInsertionCount += 1;
+  anomaly(session, event.type === 'drop' ? 'drop_large_text' : 'large_paste', 'high', () => ({
+    rationale: `${insertedLength} characters were inserted through ${event.type}.`,
+    features: { insertedLength, eventType: event.type }
+  }));
+}
+
+function checkIdleToBurst(session, event, settings, tPerf, insertedLength) {
+  if (event.type !== 'paste' && event.inputType !== 'insertFromPaste') return;
+  if (insertedLength < settings.burstMinChars) return;
+  const lastKeyTime = session.analysis.lastKeyTime || 0;
+  const idleMs = lastKeyTime ? tPerf - lastKeyTime : settings.idleThresholdMs + 1;
+  if (idleMs >= settings.idleThresholdMs) {
+    anomaly(session, 'idle_to_burst', 'high', () => ({
+      rationale: `Idle for ${Math.round(idleMs / 1000)}s before a ${insertedLength}-character insertion.`,
+      features: { idleMs: Math.round(idleMs), insertedLength }
+    }));
   }
+}
 
-  if ((event.type === 'paste' || event.type === 'drop') && insertedLength >= settings.largeInsertionChars) {
+function checkTextInjection(session, event, settings, tPerf, insertedLength) {
+  if (insertedLength < settings.largeInsertionChars || event.inputType === 'insertFromPaste') return;
+  const lastKeyTime = session.analysis.lastKeyTime;
+  const recentKey = lastKeyTime && tPerf - lastKeyTime < 1500;
+  if (!recentKey) {
     session.stats.largeInsertionCount += 1;
-    anomaly(
-      session,
-      event.type === 'drop' ? 'drop_large_text' : 'large_paste',
-      'high',
-      `${insertedLength} characters were inserted through ${event.type}.`,
-      { insertedLength, eventType: event.type }
-    );
+    anomaly(session, 'text_injection_without_typing', 'high', () => ({
+      rationale: `${insertedLength} characters appeared without nearby typing activity.`,
+      features: { insertedLength, inputType: event.inputType || 'unknown' }
+    }));
   }
+}
 
-  if ((event.type === 'paste' || event.inputType === 'insertFromPaste') && insertedLength >= settings.burstMinChars) {
-    const lastKeyTime = session.analysis.lastKeyTime || 0;
-    const idleMs = lastKeyTime ? tPerf - lastKeyTime : settings.idleThresholdMs + 1;
-    if (idleMs >= settings.idleThresholdMs) {
-      anomaly(
-        session,
-        'idle_to_burst',
-        'high',
-        `Idle for ${Math.round(idleMs / 1000)}s before a ${insertedLength}-character insertion.`,
-        { idleMs: Math.round(idleMs), insertedLength }
-      );
-    }
+const EVENT_HANDLERS = new Map([
+  ['keydown', { stat: 'keyCount', rules: [checkKeyCadence] }],
+  ['paste', { stat: 'pasteCount', rules: [markInput, checkPasteStreak, checkLargeTransfer, checkIdleToBurst] }],
+  ['copy', { stat: 'copyCount', rules: [] }],
+  ['cut', { stat: 'cutCount', rules: [] }],
+  ['drop', { stat: 'dropCount', rules: [markInput, checkLargeTransfer] }],
+  ['beforeinput', { stat: 'inputCount', rules: [markInput, checkIdleToBurst, checkTextInjection] }],
+  ['input', { stat: 'inputCount', rules: [markInput, checkIdleToBurst, checkTextInjection] }]
+]);
+
+function processEvent(session, event, settings) {
+  const stats = session.stats;
+  if (event.origin && !stats.activeDomains.includes(event.origin)) {
+    stats.activeDomains.push(event.origin);
   }
+  if (event.insertedLength) stats.totalInsertedChars += event.insertedLength;
 
-  if ((event.type === 'beforeinput' || event.type === 'input') && insertedLength >= settings.largeInsertionChars && event.inputType !== 'insertFromPaste') {
-    const recentKey = session.analysis.lastKeyTime && tPerf - session.analysis.lastKeyTime < 1500;
-    if (!recentKey) {
-      session.stats.largeInsertionCount += 1;
-      anomaly(
-        session,
-        'text_injection_without_typing',
-        'high',
-        `${insertedLength} characters appeared without nearby typing activity.`,
-        { insertedLength, inputType: event.inputType || 'unknown' }
-      );
-    }
-  }
+  const handler = EVENT_HANDLERS.get(event.type);
+  if (!handler) return;
+  stats[handler.stat] += 1;
+  if (!handler.rules.length) return;
+
+  const tPerf = Number(event.tPerf || performance.timeOrigin + performance.now());
+  const insertedLength = Number(event.insertedLength || event.clipboardLength || 0);
+  for (const rule of handler.rules) rule(session, event, settings, tPerf, insertedLength);
 }
 
+const RULE_WEIGHT_KEYS = new Map([
+  ['idle_to_burst', 'idleToBurst'],
+  ['multi_paste_streak', 'pasteStreak'],
+  ['timing_uniformity', 'uniformCadence'],
+  ['drop_large_text', 'drop'],
+  ['large_paste', 'largeInsertion']
+]);
+
 function scoreRisk(session, settings) {
   let score = 0;
-  for (const anomalyItem of session.anomalies) {
-    if (anomalyItem.ruleId.includes('idle_to_burst')) score += settings.riskWeights.idleToBurst;
-    else if (anomalyItem.ruleId.includes('multi_paste')) score += settings.riskWeights.pasteStreak;
-    else if (anomalyItem.ruleId.includes('uniform')) score += settings.riskWeights.uniformCadence;
-    else if (anomalyItem.ruleId.includes('drop')) score += settings.riskWeights.drop;
-    else if (anomalyItem.ruleId.includes('large')) score += settings.riskWeights.largeInsertion;
-    else score += 8;
+  for (const [ruleId, count] of Object.entries(ruleCounts(session))) {
+    const weightKey = RULE_WEIGHT_KEYS.get(ruleId);
+    score += count * (weightKey ? settings.riskWeights[weightKey] : 8);
   }
 
   score += Math.min(20, session.stats.pasteCount * settings.riskWeights.paste);
   return Math.min(100, Math.round(score));
 }
 
+function summarizeState(state) {
+  const session = state.session;
+  return {
+    active: state.active,
+    session: session && {
+      riskScore: session.riskScore,
+      stats: session.stats,
+      anomalyCount: session.anomalies.length,
+      latestAnomaly: session.anomalies[session.anomalies.length - 1] || null
+    }
+  };
+}
+
 async function startSession(meta = {}) {
   const settings = await getSettings();
   const session = blankSession(meta);
@@ -269,17 +399,16 @@ async function stopSession() {
   state.active = false;
   state.session.status = 'stopped';
   state.session.stoppedAt = nowIso();
-  await archiveSession(state.session);
-  await saveState(state);
+  await saveState(state, { sessions: await archiveWith(state.session) });
   return state;
 }
 
-async function archiveSession(session) {
+async function archiveWith(session) {
   const stored = await chrome.storage.local.get(['sessions']);
   const sessions = stored.sessions || [];
   const withoutCurrent = sessions.filter((s) => s.id !== session.id);
   withoutCurrent.unshift(session);
-  await chrome.storage.local.set({ sessions: withoutCurrent.slice(0, 30) });
+  return withoutCurrent.slice(0, 30);
 }
 
 async function clearCurrentSession() {
@@ -287,23 +416,41 @@ async function clearCurrentSession() {
   return DEFAULT_STATE;
 }
 
-async function recordEvent(rawEvent) {
+async function recordEvents(rawEvents) {
   const settings = await getSettings();
   const state = await getState();
-  if (!state.active || !state.session) return state;
-
-  const event = sanitizeEvent(rawEvent, settings);
-  state.session.events.push(event);
-  if (state.session.events.length > 3000) state.session.events.shift();
+  if (!state.active || !state.session || !rawEvents.length) return state;
 
-  updateStats(state.session, event);
-  evaluateEvent(state.session, event, settings);
+  const events = state.session.events;
+  for (const rawEvent of rawEvents) {
+    const event = sanitizeEvent(rawEvent, settings);
+    events.push(event);
+    processEvent(state.session, event, settings);
+  }
+  if (events.length > MAX_SESSION_EVENTS) events.splice(0, events.length - MAX_SESSION_EVENTS);
   state.session.riskScore = scoreRisk(state.session, settings);
 
   await saveState(state);
   return state;
 }
 
+const pendingEvents = [];
+let eventDrain = null;
+
+async function drainPendingEvents() {
+  try {
+    while (pendingEvents.length) await recordEvents(pendingEvents.splice(0));
+  } finally {
+    eventDrain = null;
+  }
+}
+
+function enqueueEvents(rawEvents) {
+  for (const rawEvent of rawEvents) pendingEvents.push(rawEvent);
+  if (!eventDrain) eventDrain = drainPendingEvents();
+  return eventDrain;
+}
+
 chrome.runtime.onInstalled.addListener(async () => {
   const stored = await chrome.storage.local.get(['settings', 'state']);
   if (!stored.settings) await saveSettings(DEFAULT_SETTINGS);
@@ -312,15 +459,17 @@ chrome.runtime.onInstalled.addListener(async () => {
 
 chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
   (async () => {
-    if (message?.type === 'PGW_START_SESSION') sendResponse({ ok: true, state: await startSession(message.meta || {}) });
-    else if (message?.type === 'PGW_STOP_SESSION') sendResponse({ ok: true, state: await stopSession() });
+    if (message?.type === 'PGW_START_SESSION') sendResponse({ ok: true, summary: summarizeState(await startSession(message.meta || {})) });
+    else if (message?.type === 'PGW_STOP_SESSION') sendResponse({ ok: true, summary: summarizeState(await stopSession()) });
     else if (message?.type === 'PGW_CLEAR_SESSION') sendResponse({ ok: true, state: await clearCurrentSession() });
     else if (message?.type === 'PGW_GET_STATE') sendResponse({ ok: true, state: await getState(), settings: await getSettings() });
+    else if (message?.type === 'PGW_GET_SUMMARY') sendResponse({ ok: true, summary: summarizeState(await getState()) });
     else if (message?.type === 'PGW_SAVE_SETTINGS') {
       await saveSettings(message.settings || {});
       sendResponse({ ok: true, settings: await getSettings() });
-    } else if (message?.type === 'PGW_EVENT') {
-      sendResponse({ ok: true, state: await recordEvent(message.event || {}) });
+    } else if (message?.type === 'PGW_EVENTS') {
+      await enqueueEvents(Array.isArray(message.events) ? message.events : []);
+      sendResponse({ ok: true });
     } else if (message?.type === 'PGW_GET_ARCHIVE') {
       const stored = await chrome.storage.local.get(['sessions']);
       sendResponse({ ok: true, sessions: stored.sessions || [] });
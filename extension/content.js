@@ -1,13 +1,14 @@
 (function () {
   const EDITABLE_SELECTOR = 'textarea,input,[contenteditable="true"],[role="textbox"]';
+  const FLUSH_DELAY_MS = 100;
+  const SNIPPET_SCAN_CHARS = 4096;
+  const PAGE_ORIGIN = location.origin;
   let lastValue = new WeakMap();
+  let pending = [];
+  let flushTimer = null;
 
-  function isEditable(target) {
-    return target && target.closest && target.closest(EDITABLE_SELECTOR);
-  }
-
-  function getEditable(target) {
-    return target?.closest?.(EDITABLE_SELECTOR) || target;
+  function editableFor(target) {
+    return target?.closest?.(EDITABLE_SELECTOR) || null;
   }
 
   function fieldType(el) {
@@ -35,117 +36,121 @@
 
   function safeSnippet(text) {
     if (!text) return '';
-    return String(text).replace(/\s+/g, ' ').trim().slice(0, 160);
+    return String(text).slice(0, SNIPPET_SCAN_CHARS).replace(/\s+/g, ' ').trim().slice(0, 160);
+  }
+
+  function keyCategory(e) {
+    if (e.ctrlKey || e.metaKey || e.altKey) return 'modified';
+    const key = e.key || '';
+    return key.length <= 1 ? 'character' : key.toLowerCase();
   }
 
-  function baseEvent(type, target) {
-    const el = getEditable(target);
+  function baseEvent(type, el) {
     return {
       type,
-      tPerf: performance.now(),
+      tPerf: performance.timeOrigin + performance.now(),
       fieldType: fieldType(el),
       url: location.href,
-      origin: location.origin,
+      origin: PAGE_ORIGIN,
       title: document.title || '',
       selectionLength: selectionLength(),
       isTrusted: true
     };
   }
 
-  function send(event) {
+  function flush() {
+    flushTimer = null;
+    if (!pending.length) return;
+    const events = pending;
+    pending = [];
     try {
-      chrome.runtime.sendMessage({ type: 'PGW_EVENT', event });
+      chrome.runtime.sendMessage({ type: 'PGW_EVENTS', events });
     } catch (_) {
       // Extension context may be unavailable during reloads.
     }
   }
 
+  function send(event) {
+    pending.push(event);
+    if (!flushTimer) flushTimer = setTimeout(flush, FLUSH_DELAY_MS);
+  }
+
+  window.addEventListener('pagehide', flush);
+
   document.addEventListener('keydown', (e) => {
-    if (!isEditable(e.target)) return;
-    const key = e.key || '';
-    let keyCategory = 'character';
-    if (key.length > 1) keyCategory = key.toLowerCase();
-    if (e.ctrlKey || e.metaKey || e.altKey) keyCategory = 'modified';
-
-    send({
-      ...baseEvent('keydown', e.target),
-      keyCategory,
-      modifiers: {
-        ctrl: e.ctrlKey,
-        meta: e.metaKey,
-        alt: e.altKey,
-        shift: e.shiftKey
-      }
-    });
+    const el = editableFor(e.target);
+    if (!el) return;
+    const event = baseEvent('keydown', el);
+    event.keyCategory = keyCategory(e);
+    send(event);
   }, true);
 
   document.addEventListener('paste', (e) => {
-    if (!isEditable(e.target)) return;
+    const el = editableFor(e.target);
+    if (!el) return;
     const text = e.clipboardData?.getData('text/plain') || '';
-    send({
-      ...baseEvent('paste', e.target),
-      clipboardLength: text.length,
-      insertedLength: text.length,
-      snippet: safeSnippet(text)
-    });
+    const event = baseEvent('paste', el);
+    event.clipboardLength = text.length;
+    event.insertedLength = text.length;
+    event.snippet = safeSnippet(text);
+    send(event);
   }, true);
 
   document.addEventListener('copy', (e) => {
-    if (!isEditable(e.target)) return;
-    send(baseEvent('copy', e.target));
+    const el = editableFor(e.target);
+    if (!el) return;
+    send(baseEvent('copy', el));
   }, true);
 
   document.addEventListener('cut', (e) => {
-    if (!isEditable(e.target)) return;
-    send(baseEvent('cut', e.target));
+    const el = editableFor(e.target);
+    if (!el) return;
+    send(baseEvent('cut', el));
   }, true);
 
   document.addEventListener('drop', (e) => {
-    if (!isEditable(e.target)) return;
+    const el = editableFor(e.target);
+    if (!el) return;
     const text = e.dataTransfer?.getData('text/plain') || '';
-    send({
-      ...baseEvent('drop', e.target),
-      insertedLength: text.length,
-      snippet: safeSnippet(text)
-    });
+    const event = baseEvent('drop', el);
+    event.insertedLength = text.length;
+    event.snippet = safeSnippet(text);
+    send(event);
   }, true);
 
   document.addEventListener('beforeinput', (e) => {
-    if (!isEditable(e.target)) return;
+    const el = editableFor(e.target);
+    if (!el) return;
     const data = typeof e.data === 'string' ? e.data : '';
-    const event = {
-      ...baseEvent('beforeinput', e.target),
-      inputType: e.inputType || null,
-      insertedLength: data.length,
-      snippet: safeSnippet(data)
-    };
+    if (e.inputType !== 'insertFromPaste' && e.inputType !== 'insertFromDrop' && data.length <= 20) return;
 
-    if (e.inputType === 'insertFromPaste' || e.inputType === 'insertFromDrop' || data.length > 20) {
-      send(event);
-    }
+    const event = baseEvent('beforeinput', el);
+    event.inputType = e.inputType || null;
+    event.insertedLength = data.length;
+    event.snippet = safeSnippet(data);
+    send(event);
   }, true);
 
   document.addEventListener('focusin', (e) => {
-    if (!isEditable(e.target)) return;
-    const el = getEditable(e.target);
+    const el = editableFor(e.target);
+    if (!el) return;
     lastValue.set(el, getValueLength(el));
-    send(baseEvent('focusin', e.target));
+    send(baseEvent('focusin', el));
   }, true);
 
   document.addEventListener('input', (e) => {
-    if (!isEditable(e.target)) return;
-    const el = getEditable(e.target);
+    const el = editableFor(e.target);
+    if (!el) return;
     const previous = lastValue.get(el) ?? getValueLength(el);
     const current = getValueLength(el);
     const delta = Math.max(0, current - previous);
     lastValue.set(el, current);
 
     if (delta >= 20) {
-      send({
-        ...baseEvent('input', e.target),
-        inputType: e.inputType || null,
-        insertedLength: delta
-      });
+      const event = baseEvent('input', el);
+      event.inputType = e.inputType || null;
+      event.insertedLength = delta;
+      send(event);
     }
   }, true);
 })();
@@ -18,13 +18,40 @@ const els = {
   exportPreview: document.getElementById('exportPreview')
 };
 
+const timeFormat = new Intl.DateTimeFormat(undefined, { hour: 'numeric', minute: 'numeric', second: 'numeric' });
+const dateTimeFormat = new Intl.DateTimeFormat(undefined, {
+  year: 'numeric',
+  month: 'numeric',
+  day: 'numeric',
+  hour: 'numeric',
+  minute: 'numeric',
+  second: 'numeric'
+});
+
+const EVENT_FEED_LIMIT = 140;
+const SYNC_INTERVAL_MS = 3000;
+
 let currentState = null;
 let archivedSessions = [];
+let jsonCache = { session: null, json: '' };
+let previewSession = null;
+let sessionDirty = false;
+let archiveDirty = false;
+let renderFrame = 0;
+let stateStale = false;
+let archiveStale = false;
+let syncTimer = 0;
+let lastSyncAt = 0;
 
 function send(type, payload = {}) {
   return chrome.runtime.sendMessage({ type, ...payload });
 }
 
+function setText(el, value) {
+  const text = String(value);
+  if (el.textContent !== text) el.textContent = text;
+}
+
 function riskSummary(score) {
   if (score >= 70) return 'High-risk pattern. Review event sequence before making a decision.';
   if (score >= 35) return 'Moderate risk. Signals exist but require human review.';
@@ -37,84 +64,156 @@ function eventLabel(event) {
   return `${event.type}${event.inputType ? ` · ${event.inputType}` : ''}${len ? ` · ${len} chars` : ''}`;
 }
 
-function renderItem(title, meta, body, severity) {
-  const item = document.createElement('div');
-  item.className = `item ${severity || ''}`.trim();
-  item.innerHTML = `<div class="meta"><span>${meta.left}</span><span>${meta.right}</span></div><strong>${title}</strong><p>${body}</p>`;
+const itemTemplate = document.createElement('template');
+itemTemplate.innerHTML = '<div class="item"><div class="meta"><span></span><span></span></div><strong></strong><p></p></div>';
+
+function renderItem(title, metaLeft, metaRight, body, severity) {
+  const item = itemTemplate.content.firstElementChild.cloneNode(true);
+  if (severity) item.classList.add(severity);
+  const [metaRow, heading, text] = item.children;
+  metaRow.children[0].textContent = metaLeft;
+  metaRow.children[1].textContent = metaRight;
+  heading.textContent = title;
+  text.textContent = body;
   return item;
 }
 
+function sessionJson(session) {
+  if (session !== jsonCache.session) jsonCache = { session, json: JSON.stringify(session, null, 2) };
+  return jsonCache.json;
+}
+
 function renderSession(session, active) {
   const score = session?.riskScore || 0;
-  els.riskScore.textContent = score;
-  els.riskSummary.textContent = session ? riskSummary(score) : 'No session loaded.';
-  els.pasteCount.textContent = session?.stats?.pasteCount || 0;
-  els.keyCount.textContent = session?.stats?.keyCount || 0;
-  els.flagCount.textContent = session?.anomalies?.length || 0;
-  els.sessionStatus.textContent = active ? 'Active' : 'Idle';
+  setText(els.riskScore, score);
+  setText(els.riskSummary, session ? riskSummary(score) : 'No session loaded.');
+  setText(els.pasteCount, session?.stats?.pasteCount || 0);
+  setText(els.keyCount, session?.stats?.keyCount || 0);
+  setText(els.flagCount, session?.anomalies?.length || 0);
+  setText(els.sessionStatus, active ? 'Active' : 'Idle');
   els.sessionStatus.classList.toggle('active', active);
-  els.eventCount.textContent = `${session?.events?.length || 0} events`;
+  setText(els.eventCount, `${session?.events?.length || 0} events`);
 
-  els.anomalyList.innerHTML = '';
-  const anomalies = [...(session?.anomalies || [])].reverse();
+  const anomalies = session?.anomalies || [];
   if (!anomalies.length) {
     els.anomalyList.className = 'timeline empty';
     els.anomalyList.textContent = 'No anomalies yet.';
   } else {
     els.anomalyList.className = 'timeline';
-    for (const a of anomalies) {
-      els.anomalyList.appendChild(renderItem(
+    const rows = document.createDocumentFragment();
+    for (let i = anomalies.length - 1; i >= 0; i -= 1) {
+      const a = anomalies[i];
+      rows.appendChild(renderItem(
         a.ruleId.replaceAll('_', ' '),
-        { left: a.severity.toUpperCase(), right: new Date(a.t).toLocaleTimeString() },
+        a.severity.toUpperCase(),
+        timeFormat.format(new Date(a.t)),
         a.rationale,
         a.severity
       ));
     }
+    els.anomalyList.replaceChildren(rows);
   }
 
-  els.eventList.innerHTML = '';
-  const events = [...(session?.events || [])].reverse().slice(0, 140);
+  const events = session?.events || [];
   if (!events.length) {
     els.eventList.className = 'event-list empty';
     els.eventList.textContent = 'No event metadata yet.';
   } else {
     els.eventList.className = 'event-list';
-    for (const e of events) {
-      els.eventList.appendChild(renderItem(
+    const rows = document.createDocumentFragment();
+    const oldest = Math.max(0, events.length - EVENT_FEED_LIMIT);
+    for (let i = events.length - 1; i >= oldest; i -= 1) {
+      const e = events[i];
+      rows.appendChild(renderItem(
         eventLabel(e),
-        { left: e.fieldType || 'unknown', right: new Date(e.t).toLocaleTimeString() },
+        e.fieldType || 'unknown',
+        timeFormat.format(new Date(e.t)),
         `${e.origin || 'local page'} · ${e.title || 'Untitled page'}`,
         ''
       ));
     }
+    els.eventList.replaceChildren(rows);
   }
 
-  els.exportPreview.textContent = session ? JSON.stringify(session, null, 2) : 'No session loaded.';
+  previewSession = session;
+  renderExportPreview();
+}
+
+function renderExportPreview() {
+  if (panels.export.classList.contains('hidden')) return;
+  els.exportPreview.textContent = previewSession ? sessionJson(previewSession) : 'No session loaded.';
 }
 
 function renderArchive() {
-  els.archiveList.innerHTML = '';
   if (!archivedSessions.length) {
     els.archiveList.className = 'archive-list empty';
     els.archiveList.textContent = 'No archived sessions.';
     return;
   }
   els.archiveList.className = 'archive-list';
+  const rows = document.createDocumentFragment();
   for (const session of archivedSessions) {
     const item = renderItem(
       session.title || 'Controlled writing session',
-      { left: `${session.riskScore || 0} risk`, right: new Date(session.startedAt).toLocaleString() },
+      `${session.riskScore || 0} risk`,
+      dateTimeFormat.format(new Date(session.startedAt)),
       `${session.events?.length || 0} events · ${session.anomalies?.length || 0} flags · ${session.stats?.activeDomains?.join(', ') || 'no domain'}`,
       session.riskScore >= 70 ? 'high' : session.riskScore >= 35 ? 'medium' : ''
     );
     item.addEventListener('click', () => renderSession(session, false));
-    els.archiveList.appendChild(item);
+    rows.appendChild(item);
   }
+  els.archiveList.replaceChildren(rows);
+}
+
+function renderDirty() {
+  renderFrame = 0;
+  if (document.hidden) return;
+  if (sessionDirty) {
+    sessionDirty = false;
+    renderSession(currentState?.session, Boolean(currentState?.active));
+  }
+  if (archiveDirty) {
+    archiveDirty = false;
+    renderArchive();
+  }
+}
+
+function requestRender() {
+  if (!renderFrame) renderFrame = requestAnimationFrame(renderDirty);
+}
+
+async function syncStale() {
+  syncTimer = 0;
+  if (document.hidden) return;
+  const wantState = stateStale;
+  const wantArchive = archiveStale;
+  if (!wantState && !wantArchive) return;
+  stateStale = false;
+  archiveStale = false;
+  lastSyncAt = Date.now();
+  const [stateResp, archiveResp] = await Promise.all([
+    wantState ? send('PGW_GET_STATE') : null,
+    wantArchive ? send('PGW_GET_ARCHIVE') : null
+  ]);
+  if (stateResp) {
+    currentState = stateResp.state;
+    sessionDirty = true;
+  }
+  if (archiveResp) {
+    archivedSessions = archiveResp.sessions || [];
+    archiveDirty = true;
+  }
+  requestRender();
+}
+
+function scheduleSync() {
+  if (syncTimer || document.hidden || (!stateStale && !archiveStale)) return;
+  syncTimer = setTimeout(syncStale, Math.max(0, lastSyncAt + SYNC_INTERVAL_MS - Date.now()));
 }
 
 async function refresh() {
-  const stateResp = await send('PGW_GET_STATE');
-  const archiveResp = await send('PGW_GET_ARCHIVE');
+  const [stateResp, archiveResp] = await Promise.all([send('PGW_GET_STATE'), send('PGW_GET_ARCHIVE')]);
   currentState = stateResp.state;
   archivedSessions = archiveResp.sessions || [];
   renderSession(currentState?.session, Boolean(currentState?.active));
@@ -131,10 +230,18 @@ function download(filename, content, type) {
   URL.revokeObjectURL(url);
 }
 
+const CSV_COLUMNS = ['t', 'type', 'inputType', 'fieldType', 'origin', 'insertedLength', 'clipboardLength', 'selectionLength'];
+
 function toCsv(session) {
-  const header = ['t', 'type', 'inputType', 'fieldType', 'origin', 'insertedLength', 'clipboardLength', 'selectionLength'];
-  const rows = (session?.events || []).map((e) => header.map((key) => JSON.stringify(e[key] ?? '')).join(','));
-  return [header.join(','), ...rows].join('\n');
+  let csv = CSV_COLUMNS.join(',');
+  for (const e of session?.events || []) {
+    csv += '\n';
+    for (let i = 0; i < CSV_COLUMNS.length; i += 1) {
+      if (i) csv += ',';
+      csv += JSON.stringify(e[CSV_COLUMNS[i]] ?? '');
+    }
+  }
+  return csv;
 }
 
 document.querySelectorAll('.nav').forEach((button) => {
@@ -143,6 +250,7 @@ document.querySelectorAll('.nav').forEach((button) => {
     button.classList.add('active');
     Object.values(panels).forEach((panel) => panel.classList.add('hidden'));
     panels[button.dataset.panel].classList.remove('hidden');
+    renderExportPreview();
   });
 });
 
@@ -151,7 +259,7 @@ document.getElementById('clearBtn').addEventListener('click', async () => { awai
 document.getElementById('exportJsonBtn').addEventListener('click', () => {
   const session = currentState?.session;
   if (!session) return;
-  download(`pasteguard-session-${session.id}.json`, JSON.stringify(session, null, 2), 'application/json');
+  download(`pasteguard-session-${session.id}.json`, sessionJson(session), 'application/json');
 });
 document.getElementById('exportCsvBtn').addEventListener('click', () => {
   const session = currentState?.session;
@@ -159,5 +267,17 @@ document.getElementById('exportCsvBtn').addEventListener('click', () => {
   download(`pasteguard-events-${session.id}.csv`, toCsv(session), 'text/csv');
 });
 
+// The background announces which keys it wrote; the data itself is fetched at most once per interval, and only while visible.
+chrome.runtime.onMessage.addListener((message) => {
+  if (message?.type !== 'PGW_STORAGE_CHANGED') return;
+  if (message.keys?.includes('state')) stateStale = true;
+  if (message.keys?.includes('sessions')) archiveStale = true;
+  scheduleSync();
+});
+
+document.addEventListener('visibilitychange', () => {
+  renderDirty();
+  scheduleSync();
+});
+
 refresh();
-setInterval(refresh, 3000);
@@ -1,12 +1,13 @@
 const ids = ['captureSnippets', 'snippetMaxChars', 'idleThresholdMs', 'burstMinChars', 'largeInsertionChars', 'pasteStreakCount', 'pasteStreakWindowMs', 'uniformCadenceStddevMs'];
+const fields = ids.map((id) => [id, document.getElementById(id)]);
+const statusEl = document.getElementById('status');
 
 function send(type, payload = {}) { return chrome.runtime.sendMessage({ type, ...payload }); }
 
 async function load() {
   const response = await send('PGW_GET_STATE');
   const settings = response.settings || {};
-  for (const id of ids) {
-    const el = document.getElementById(id);
+  for (const [id, el] of fields) {
     if (el.type === 'checkbox') el.checked = Boolean(settings[id]);
     else el.value = settings[id] ?? '';
   }
@@ -14,13 +15,12 @@ async function load() {
 
 async function save() {
   const settings = {};
-  for (const id of ids) {
-    const el = document.getElementById(id);
+  for (const [id, el] of fields) {
     settings[id] = el.type === 'checkbox' ? el.checked : Number(el.value);
   }
   await send('PGW_SAVE_SETTINGS', { settings });
-  document.getElementById('status').textContent = 'Settings saved.';
-  setTimeout(() => (document.getElementById('status').textContent = ''), 2000);
+  statusEl.textContent = 'Settings saved.';
+  setTimeout(() => (statusEl.textContent = ''), 2000);
 }
 
 document.getElementById('saveBtn').addEventListener('click', save);
@@ -23,9 +23,9 @@ function riskLabel(score) {
   return 'No risk signals yet.';
 }
 
-function render(state) {
-  const active = Boolean(state?.active);
-  const session = state?.session;
+function render(summary) {
+  const active = Boolean(summary?.active);
+  const session = summary?.session;
   els.statusPill.textContent = active ? 'Active' : 'Idle';
   els.statusPill.classList.toggle('active', active);
   els.startBtn.disabled = active;
@@ -37,26 +37,26 @@ function render(state) {
   els.riskText.textContent = active ? riskLabel(score) : 'No active session.';
   els.pasteCount.textContent = session?.stats?.pasteCount || 0;
   els.keyCount.textContent = session?.stats?.keyCount || 0;
-  els.anomalyCount.textContent = session?.anomalies?.length || 0;
+  els.anomalyCount.textContent = session?.anomalyCount || 0;
 
-  const latest = session?.anomalies?.[session.anomalies.length - 1];
+  const latest = session?.latestAnomaly;
   els.latestFlag.textContent = latest ? `${latest.severity.toUpperCase()}: ${latest.rationale}` : 'No anomaly recorded.';
 }
 
 async function refresh() {
-  const response = await send('PGW_GET_STATE');
-  render(response.state);
+  const response = await send('PGW_GET_SUMMARY');
+  render(response.summary);
 }
 
 els.startBtn.addEventListener('click', async () => {
   const [tab] = await chrome.tabs.query({ active: true, currentWindow: true });
   const response = await send('PGW_START_SESSION', { meta: { title: tab?.title || 'Controlled writing session' } });
-  render(response.state);
+  render(response.summary);
 });
 
 els.stopBtn.addEventListener('click', async () => {
   const response = await send('PGW_STOP_SESSION');
-  render(response.state);
+  render(response.summary);
 });
 
 els.dashboardBtn.addEventListener('click', () => chrome.tabs.create({ url: chrome.runtime.getURL('dashboard.html') }));